@@ -1,14 +1,21 @@
 import os
+import itertools
+import logging
+import time
+from contextlib import closing
 import pandas as pd
 import psycopg2
 from dotenv import load_dotenv
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+from db_replicas import REPLICA_LAG_QUERY, is_connection_error, parse_replica_hosts
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database connection parameters
 DB_PARAMS = {
     'host': os.getenv('DB_HOST'),
@@ -18,13 +25,86 @@ DB_PARAMS = {
     'port': os.getenv('DB_PORT')
 }
 
+# Optional read replicas for analysis and exports, e.g. DB_REPLICA_HOSTS=replica1:5432,replica2,[::1]:5433
+REPLICA_PARAMS = [
+    {**DB_PARAMS, 'host': host, 'port': port or DB_PARAMS['port']}
+    for host, port in parse_replica_hosts(os.getenv('DB_REPLICA_HOSTS', ''))
+]
+REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '30'))
+REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '10'))
+
+_replica_cursor = itertools.count()
+_replica_health = {}  # replica index -> (checked_at, healthy)
+
 def get_db_connection():
     """Create and return a database connection"""
     return psycopg2.connect(**DB_PARAMS)
 
+def mark_replica_unhealthy(index):
+    """Take a replica out of rotation until its next health check"""
+    _replica_health[index] = (time.monotonic(), False)
+
+def get_replica_connection(index):
+    """Connect to a read replica, or return None if it is down or lagging"""
+    params = REPLICA_PARAMS[index]
+    now = time.monotonic()
+    cached = _replica_health.get(index)
+    fresh = cached is not None and now - cached[0] < REPLICA_CHECK_INTERVAL
+    if fresh and not cached[1]:
+        return None
+
+    try:
+        conn = psycopg2.connect(connect_timeout=3, **params)
+    except psycopg2.OperationalError as e:
+        logger.warning("Read replica %s unavailable: %s", params['host'], e)
+        mark_replica_unhealthy(index)
+        return None
+    if fresh:
+        return conn
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(REPLICA_LAG_QUERY)
+            lag = cur.fetchone()[0]
+        healthy = lag is not None and float(lag) <= REPLICA_MAX_LAG
+        if not healthy:
+            logger.warning("Read replica %s lag %s exceeds limit", params['host'], lag)
+    except psycopg2.Error as e:
+        logger.warning("Read replica %s health check failed: %s", params['host'], e)
+        healthy = False
+
+    _replica_health[index] = (now, healthy)
+    if not healthy:
+        conn.close()
+        return None
+    return conn
+
+def get_read_connection():
+    """Return (connection, replica index) for the next healthy read replica, or the primary with None"""
+    if REPLICA_PARAMS:
+        start = next(_replica_cursor)
+        for offset in range(len(REPLICA_PARAMS)):
+            index = (start + offset) % len(REPLICA_PARAMS)
+            conn = get_replica_connection(index)
+            if conn is not None:
+                return conn, index
+        logger.warning("No healthy read replica available, using primary")
+    return get_db_connection(), None
+
 def execute_query(query):
     """Execute a SQL query and return results as a pandas DataFrame"""
-    with get_db_connection() as conn:
+    conn, replica = get_read_connection()
+    try:
+        with closing(conn):
+            return pd.read_sql_query(query, conn)
+    except (psycopg2.Error, pd.errors.DatabaseError) as e:
+        # Only connection failures on a replica are retried
+        if replica is None or not is_connection_error(e):
+            raise
+        logger.warning("Read replica %s failed, retrying on primary: %s", REPLICA_PARAMS[replica]['host'], e)
+        mark_replica_unhealthy(replica)
+
+    with closing(get_db_connection()) as conn:
         return pd.read_sql_query(query, conn)
 
 def analyze_company_wise_placements():
@@ -141,6 +221,7 @@ def generate_excel_report():
 
 def main():
     """Main function to run the analysis"""
+    logging.basicConfig(format='%(levelname)s: %(message)s')
     try:
         print("Starting placement analysis...")
         
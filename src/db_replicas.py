@@ -0,0 +1,47 @@
+import psycopg2
+
+# Shared by web/app.py and src/analyze_placements.py so both route reads the same way
+
+# A replica counts as caught up while a WAL receiver is connected and it has
+# replayed everything received; otherwise lag is measured from the last
+# replayed transaction. Only the existence of a pg_stat_wal_receiver row is
+# checked: roles without pg_read_all_stats see NULL in every column but pid,
+# so filtering on status would push idle, caught-up replicas over the lag limit.
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN EXISTS (SELECT 1 FROM pg_stat_wal_receiver)
+         AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END AS lag_seconds
+"""
+
+def parse_replica_host(replica_host):
+    """Split 'host', 'host:port', '[ipv6]' or '[ipv6]:port' into (host, port)"""
+    if replica_host.startswith('['):
+        host, _, rest = replica_host[1:].partition(']')
+        return host, rest[1:] if rest.startswith(':') else ''
+    if replica_host.count(':') > 1:
+        # Bare IPv6 address without a port
+        return replica_host, ''
+    host, _, port = replica_host.partition(':')
+    return host, port
+
+def parse_replica_hosts(value):
+    """Parse a comma-separated DB_REPLICA_HOSTS value into (host, port) pairs"""
+    replicas = []
+    for replica_host in value.split(','):
+        host, port = parse_replica_host(replica_host.strip())
+        if host:
+            replicas.append((host, port))
+    return replicas
+
+def is_connection_error(exc):
+    """Return True if a connection failure appears anywhere in the exception chain"""
+    # SQLAlchemy and pandas wrap driver errors, and pandas' rollback on a dead
+    # connection raises InterfaceError with the original OperationalError as context
+    while exc is not None:
+        if isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
@@ -0,0 +1,14 @@
+import os
+import sys
+
+# The application modules read their configuration at import time
+os.environ.setdefault('DB_USER', 'placement')
+os.environ.setdefault('DB_PASSWORD', 'placement')
+os.environ.setdefault('DB_HOST', 'primary')
+os.environ.setdefault('DB_PORT', '5432')
+os.environ.setdefault('DB_NAME', 'placement_tracker')
+os.environ['DB_REPLICA_HOSTS'] = 'replica-a,replica-b:5433'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'web'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
@@ -0,0 +1,112 @@
+import itertools
+
+import pandas as pd
+import psycopg2
+import pytest
+
+import analyze_placements
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        if self.conn.dropped and query != analyze_placements.REPLICA_LAG_QUERY:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+
+    def fetchone(self):
+        return (self.conn.lag,)
+
+
+class FakeConnection:
+    def __init__(self, host, lag=0):
+        self.host = host
+        self.lag = lag
+        self.dropped = False
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.dropped:
+            raise psycopg2.InterfaceError('connection already closed')
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def fake_connect(**params):
+        conn = FakeConnection(params['host'])
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(analyze_placements.psycopg2, 'connect', fake_connect)
+    monkeypatch.setattr(analyze_placements, '_replica_cursor', itertools.count())
+    monkeypatch.setattr(analyze_placements, '_replica_health', {})
+    return opened
+
+
+def test_execute_query_retries_on_primary(connections, monkeypatch):
+    def fake_read_sql_query(query, conn):
+        if conn.host != 'primary':
+            raise pd.errors.DatabaseError('query failed') from psycopg2.OperationalError('connection lost')
+        return pd.DataFrame({'total_offers': [3]})
+
+    monkeypatch.setattr(analyze_placements.pd, 'read_sql_query', fake_read_sql_query)
+    result = analyze_placements.execute_query('SELECT 1')
+    assert result['total_offers'].tolist() == [3]
+    assert [conn.host for conn in connections] == ['replica-a', 'primary']
+    assert all(conn.closed for conn in connections)
+    assert analyze_placements._replica_health[0][1] is False
+
+
+def test_execute_query_retries_when_replica_connection_drops(connections, monkeypatch):
+    connect = analyze_placements.psycopg2.connect
+
+    def dropping_connect(**params):
+        conn = connect(**params)
+        conn.dropped = params['host'] != 'primary'
+        return conn
+
+    monkeypatch.setattr(analyze_placements.psycopg2, 'connect', dropping_connect)
+    # Run the real pandas reader so its rollback-on-error wrapping is exercised
+    monkeypatch.setattr(FakeCursor, 'description', [('total_offers',)], raising=False)
+    monkeypatch.setattr(FakeCursor, 'fetchall', lambda self: [(3,)], raising=False)
+    monkeypatch.setattr(FakeCursor, 'close', lambda self: None, raising=False)
+    with pytest.warns(UserWarning):
+        result = analyze_placements.execute_query('SELECT 1')
+    assert result['total_offers'].tolist() == [3]
+    assert [conn.host for conn in connections] == ['replica-a', 'primary']
+    assert analyze_placements._replica_health[0][1] is False
+
+
+def test_execute_query_does_not_retry_query_errors(connections, monkeypatch):
+    def fake_read_sql_query(query, conn):
+        raise pd.errors.DatabaseError('syntax error') from psycopg2.ProgrammingError('syntax error')
+
+    monkeypatch.setattr(analyze_placements.pd, 'read_sql_query', fake_read_sql_query)
+    with pytest.raises(pd.errors.DatabaseError):
+        analyze_placements.execute_query('SELEC 1')
+    assert [conn.host for conn in connections] == ['replica-a']
+
+
+def test_health_check_cached_between_queries(connections, monkeypatch):
+    checks = []
+    monkeypatch.setattr(FakeCursor, 'execute', lambda self, query: checks.append(self.conn.host))
+    monkeypatch.setattr(analyze_placements.pd, 'read_sql_query', lambda query, conn: pd.DataFrame())
+    for _ in range(4):
+        analyze_placements.execute_query('SELECT 1')
+    assert [conn.host for conn in connections] == ['replica-a', 'replica-b', 'replica-a', 'replica-b']
+    assert checks == ['replica-a', 'replica-b']
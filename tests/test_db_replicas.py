@@ -0,0 +1,38 @@
+import pandas as pd
+import psycopg2
+
+from db_replicas import is_connection_error, parse_replica_host, parse_replica_hosts
+
+
+def test_parse_replica_host():
+    assert parse_replica_host('replica') == ('replica', '')
+    assert parse_replica_host('replica:5433') == ('replica', '5433')
+    assert parse_replica_host('10.0.0.2:5433') == ('10.0.0.2', '5433')
+    assert parse_replica_host('::1') == ('::1', '')
+    assert parse_replica_host('[::1]') == ('::1', '')
+    assert parse_replica_host('[fe80::1]:5433') == ('fe80::1', '5433')
+
+
+def test_parse_replica_hosts():
+    assert parse_replica_hosts('') == []
+    assert parse_replica_hosts('a, b:5433 ,,[::1]:6000') == [('a', ''), ('b', '5433'), ('::1', '6000')]
+
+
+def test_is_connection_error_walks_exception_chain():
+    # Mirrors pandas failing to roll back on a dead connection
+    try:
+        try:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+        except psycopg2.OperationalError:
+            raise psycopg2.InterfaceError('connection already closed')
+    except psycopg2.InterfaceError as inner:
+        error = pd.errors.DatabaseError('unable to rollback')
+        error.__cause__ = inner
+    assert is_connection_error(error)
+
+
+def test_is_connection_error_ignores_query_errors():
+    error = pd.errors.DatabaseError('syntax error')
+    error.__cause__ = psycopg2.ProgrammingError('syntax error')
+    assert not is_connection_error(error)
+    assert not is_connection_error(ValueError('bad value'))
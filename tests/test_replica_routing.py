@@ -0,0 +1,160 @@
+import itertools
+
+import pandas as pd
+import psycopg2
+import pytest
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+import app as app_module
+from app import app, db, User, JobOffer
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        return self
+
+    def scalar(self):
+        self.engine.probes += 1
+        if self.engine.on_probe:
+            self.engine.on_probe()
+        return self.engine.lag
+
+
+class FakeEngine:
+    def __init__(self, lag=0, error=None, on_probe=None):
+        self.lag = lag
+        self.error = error
+        self.on_probe = on_probe
+        self.probes = 0
+
+    def connect(self):
+        if self.error:
+            raise self.error
+        return FakeConnection(self)
+
+
+@pytest.fixture(autouse=True)
+def reset_routing(monkeypatch):
+    monkeypatch.setattr(app_module, '_replica_cursor', itertools.count())
+    monkeypatch.setattr(app_module, '_replica_health', {})
+
+
+@pytest.fixture
+def fake_engines(monkeypatch):
+    engines = {'replica_0': FakeEngine(), 'replica_1': FakeEngine()}
+    monkeypatch.setattr(type(db), 'engines', property(lambda self: engines))
+    return engines
+
+
+def test_replica_binds_configured():
+    binds = app.config['SQLALCHEMY_BINDS']
+    assert list(binds) == ['replica_0', 'replica_1']
+    assert '@replica-a:5432/' in binds['replica_0']['url']
+    assert '@replica-b:5433/' in binds['replica_1']['url']
+
+
+def test_reads_rotate_across_replicas(monkeypatch):
+    monkeypatch.setattr(app_module, 'check_replica', lambda bind_key: True)
+    picked = []
+    for _ in range(4):
+        with app.test_request_context():
+            picked.append(app_module.get_read_bind())
+    assert picked == ['replica_0', 'replica_1', 'replica_0', 'replica_1']
+
+
+def test_read_bind_pinned_for_request(monkeypatch):
+    monkeypatch.setattr(app_module, 'check_replica', lambda bind_key: True)
+    with app.test_request_context():
+        assert {app_module.get_read_bind() for _ in range(3)} == {'replica_0'}
+
+
+def test_unhealthy_replica_skipped(monkeypatch):
+    monkeypatch.setattr(app_module, 'check_replica', lambda bind_key: bind_key != 'replica_0')
+    for _ in range(2):
+        with app.test_request_context():
+            assert app_module.get_read_bind() == 'replica_1'
+
+
+def test_primary_used_when_no_replica_healthy(monkeypatch):
+    monkeypatch.setattr(app_module, 'check_replica', lambda bind_key: False)
+    with app.test_request_context():
+        assert app_module.get_read_bind() is None
+
+
+def test_check_replica_rejects_lagging_replica(fake_engines):
+    fake_engines['replica_0'].lag = app.config['REPLICA_MAX_LAG'] + 1
+    fake_engines['replica_1'].lag = None
+    assert app_module.check_replica('replica_0') is False
+    assert app_module.check_replica('replica_1') is False
+
+
+def test_check_replica_rejects_unreachable_replica(fake_engines):
+    fake_engines['replica_0'].error = OperationalError('SELECT 1', {}, Exception('down'))
+    assert app_module.check_replica('replica_0') is False
+
+
+def test_check_replica_caches_result(fake_engines):
+    assert app_module.check_replica('replica_0') is True
+    assert app_module.check_replica('replica_0') is True
+    assert fake_engines['replica_0'].probes == 1
+
+
+def test_check_replica_probes_once_per_interval(fake_engines):
+    nested = []
+    # A caller arriving while the probe is running reuses the previous result
+    fake_engines['replica_0'].on_probe = lambda: nested.append(app_module.check_replica('replica_0'))
+    assert app_module.check_replica('replica_0') is True
+    assert nested == [False]
+    assert fake_engines['replica_0'].probes == 1
+
+
+def test_read_sql_falls_back_to_primary_on_replica_failure(monkeypatch):
+    monkeypatch.setattr(app_module, 'check_replica', lambda bind_key: True)
+    used = []
+
+    def fake_read_sql_query(query, engine):
+        used.append(engine)
+        if engine is db.engines['replica_0']:
+            orig = psycopg2.OperationalError('server closed the connection unexpectedly')
+            raise OperationalError(query, {}, orig) from orig
+        return pd.DataFrame({'total_students': [1]})
+
+    monkeypatch.setattr(app_module.pd, 'read_sql_query', fake_read_sql_query)
+    with app.test_request_context():
+        app_module.read_sql('SELECT 1')
+        app_module.read_sql('SELECT 2')
+        assert used == [db.engines['replica_0'], db.engine, db.engine]
+    assert app_module._replica_health['replica_0'][1] is False
+
+
+def test_read_sql_does_not_retry_query_errors(monkeypatch):
+    monkeypatch.setattr(app_module, 'check_replica', lambda bind_key: True)
+    used = []
+
+    def fake_read_sql_query(query, engine):
+        used.append(engine)
+        orig = psycopg2.ProgrammingError('syntax error')
+        raise ProgrammingError(query, {}, orig) from orig
+
+    monkeypatch.setattr(app_module.pd, 'read_sql_query', fake_read_sql_query)
+    with app.test_request_context():
+        with pytest.raises(ProgrammingError):
+            app_module.read_sql('SELEC 1')
+        assert used == [db.engines['replica_0']]
+        assert app_module.get_read_bind() == 'replica_0'
+
+
+def test_auth_and_writes_use_primary():
+    with app.app_context():
+        assert db.session.get_bind(mapper=User.__mapper__) is db.engine
+        assert db.session.get_bind(mapper=JobOffer.__mapper__) is db.engine
+        assert db.session.get_bind() is db.engine
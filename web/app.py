@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -9,6 +9,16 @@ import plotly.express as px
 import json
 from datetime import datetime
 import urllib.parse
+import itertools
+import threading
+import sys
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Replica host parsing and health checks are shared with the analysis scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from db_replicas import REPLICA_LAG_QUERY, is_connection_error, parse_replica_hosts
 
 # Load environment variables
 load_dotenv()
@@ -26,6 +36,21 @@ db_name = os.getenv('DB_NAME')
 app.config['SQLALCHEMY_DATABASE_URI'] = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Optional read replicas for analytics queries, e.g. DB_REPLICA_HOSTS=replica1:5432,replica2,[::1]:5433
+# Replicas share the primary's credentials and database name; the port defaults to DB_PORT
+replica_binds = {}
+for i, (host, port) in enumerate(parse_replica_hosts(os.getenv('DB_REPLICA_HOSTS', ''))):
+    if ':' in host:
+        host = f'[{host}]'
+    replica_binds[f'replica_{i}'] = {
+        'url': f"postgresql://{db_user}:{db_password}@{host}:{port or db_port}/{db_name}",
+        'connect_args': {'connect_timeout': 3},
+        'pool_pre_ping': True
+    }
+app.config['SQLALCHEMY_BINDS'] = replica_binds
+app.config['REPLICA_MAX_LAG'] = float(os.getenv('DB_REPLICA_MAX_LAG', '30'))
+app.config['REPLICA_CHECK_INTERVAL'] = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '10'))
+
 db = SQLAlchemy(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -79,6 +104,82 @@ class JobOffer(db.Model):
 def load_user(user_id):
     return User.query.get(int(user_id))
 
+# Read replica routing
+# Analytics helpers read through read_sql(); auth and writes always use the primary
+_replica_cursor = itertools.count()
+_replica_health = {}  # bind key -> (checked_at, healthy)
+_replica_lock = threading.Lock()
+
+def check_replica(bind_key):
+    """Return True if the replica is reachable and within the allowed lag"""
+    now = time.monotonic()
+    with _replica_lock:
+        cached = _replica_health.get(bind_key)
+        if cached and now - cached[0] < app.config['REPLICA_CHECK_INTERVAL']:
+            return cached[1]
+        # Claim this interval's check so concurrent callers reuse the last result
+        # instead of all probing (and possibly timing out on) the same replica
+        _replica_health[bind_key] = (now, cached[1] if cached else False)
+
+    try:
+        with db.engines[bind_key].connect() as conn:
+            lag = conn.execute(text(REPLICA_LAG_QUERY)).scalar()
+        healthy = lag is not None and float(lag) <= app.config['REPLICA_MAX_LAG']
+        if not healthy:
+            app.logger.warning('Read replica %s lag %s exceeds limit', bind_key, lag)
+    except SQLAlchemyError as e:
+        app.logger.warning('Read replica %s health check failed: %s', bind_key, e)
+        healthy = False
+
+    with _replica_lock:
+        _replica_health[bind_key] = (now, healthy)
+    return healthy
+
+def mark_replica_unhealthy(bind_key):
+    """Take a replica out of rotation until its next health check"""
+    with _replica_lock:
+        _replica_health[bind_key] = (time.monotonic(), False)
+
+def pick_read_bind():
+    """Pick the next healthy read replica in round-robin order, or None for the primary"""
+    bind_keys = list(app.config['SQLALCHEMY_BINDS'])
+    if not bind_keys:
+        return None
+
+    start = next(_replica_cursor)
+    for offset in range(len(bind_keys)):
+        bind_key = bind_keys[(start + offset) % len(bind_keys)]
+        if check_replica(bind_key):
+            return bind_key
+
+    app.logger.warning('No healthy read replica available, using primary')
+    return None
+
+def get_read_bind():
+    """Return the read bind for the current request, picking one on first use"""
+    # Pin the request to one database so figures combined on a page agree
+    if 'read_bind' not in g:
+        g.read_bind = pick_read_bind()
+    return g.read_bind
+
+def read_sql(query):
+    """Run a read-only analytics query on a replica, falling back to the primary"""
+    bind_key = get_read_bind()
+    if bind_key is None:
+        return pd.read_sql_query(query, db.engine)
+
+    try:
+        return pd.read_sql_query(query, db.engines[bind_key])
+    except (SQLAlchemyError, pd.errors.DatabaseError) as e:
+        # Only connection failures on the replica are retried
+        if not is_connection_error(e):
+            raise
+        app.logger.warning('Read replica %s failed, retrying on primary: %s', bind_key, e)
+        mark_replica_unhealthy(bind_key)
+        # Stay on the primary for the rest of this request
+        g.read_bind = None
+        return pd.read_sql_query(query, db.engine)
+
 # Routes
 @app.route('/')
 def index():
@@ -148,7 +249,7 @@ def get_placement_statistics():
     LEFT JOIN job_offer jo ON s.student_id = jo.student_id
     GROUP BY d.dept_name
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['total_offers'] = df['total_offers'].astype(int)
@@ -168,7 +269,7 @@ def get_company_data():
     LEFT JOIN job_offer jo ON c.company_id = jo.company_id
     GROUP BY c.company_id, c.company_name, c.industry
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['total_offers'] = df['total_offers'].astype(int)
@@ -190,7 +291,7 @@ def get_student_data():
     LEFT JOIN job_offer jo ON s.student_id = jo.student_id
     GROUP BY s.student_id, s.first_name, s.last_name, d.dept_name, s.cgpa
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['cgpa'] = df['cgpa'].astype(float)
@@ -212,7 +313,7 @@ def generate_analysis_plots():
     JOIN department d ON s.dept_id = d.dept_id
     WHERE jo.is_accepted = true
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['package_amount'] = df['package_amount'].astype(float)
@@ -238,7 +339,7 @@ def generate_analysis_plots():
     GROUP BY EXTRACT(MONTH FROM jo.offer_date)
     ORDER BY month
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['month'] = df['month'].astype(int)
@@ -266,7 +367,7 @@ def generate_analysis_plots():
     LEFT JOIN job_offer jo ON s.student_id = jo.student_id
     GROUP BY d.dept_name
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['placement_rate'] = df['placement_rate'].astype(float)
@@ -291,7 +392,7 @@ def generate_analysis_plots():
     LEFT JOIN job_offer jo ON c.company_id = jo.company_id
     GROUP BY c.industry
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['total_offers'] = df['total_offers'].astype(int)
@@ -316,7 +417,7 @@ def generate_analysis_plots():
     GROUP BY EXTRACT(MONTH FROM jo.offer_date)
     ORDER BY month
     """
-    df = pd.read_sql_query(query, db.engine)
+    df = read_sql(query)
     
     # Convert NumPy types to Python native types
     df['month'] = df['month'].astype(int)
@@ -342,7 +443,7 @@ def get_key_statistics():
     SELECT COUNT(*) as total_students
     FROM student
     """
-    total_students = pd.read_sql_query(query, db.engine)['total_students'].iloc[0]
+    total_students = read_sql(query)['total_students'].iloc[0]
     
     # Placed students
     query = """
@@ -351,7 +452,7 @@ def get_key_statistics():
     JOIN job_offer jo ON s.student_id = jo.student_id
     WHERE jo.is_accepted = true
     """
-    placed_students = pd.read_sql_query(query, db.engine)['placed_students'].iloc[0]
+    placed_students = read_sql(query)['placed_students'].iloc[0]
     
     # Average package
     query = """
@@ -359,7 +460,7 @@ def get_key_statistics():
     FROM job_offer jo
     WHERE jo.is_accepted = true
     """
-    avg_package = pd.read_sql_query(query, db.engine)['avg_package'].iloc[0]
+    avg_package = read_sql(query)['avg_package'].iloc[0]
     
     # Placement rate
     placement_rate = (placed_students / total_students) * 100 if total_students > 0 else 0